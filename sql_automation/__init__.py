@@ -2,4 +2,5 @@ __all__ = [
     "config",
     "renderer",
     "bigquery_ops",
+    "cache",
 ]
\ No newline at end of file
@@ -1,40 +1,140 @@
 from __future__ import annotations
 
+import functools
 import logging
+import threading
+import time
 from dataclasses import dataclass
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 
+import grpc
+from google.api_core import exceptions as api_exceptions
 from google.cloud import bigquery
 from google.cloud import bigquery_datatransfer_v1
+from google.cloud.bigquery_datatransfer_v1.services.data_transfer_service.transports import (
+    DataTransferServiceGrpcTransport,
+)
 
+from .cache import TTLCache, content_digest, discard_state, load_state, update_state
 from .config import JobSpec
 
 logger = logging.getLogger(__name__)
 
+# client construction does ADC discovery, token minting and channel setup,
+# so clients are created once per process and shared between calls
+_client_lock = threading.Lock()
 
-@dataclass
+
+@functools.lru_cache(maxsize=4)
+def _bq_client(project_id: Optional[str]) -> bigquery.Client:
+    return bigquery.Client(project=project_id)
+
+
+# keep the shared channel warm between deploys instead of re-doing TLS/HTTP2 setup after idling
+_GRPC_CHANNEL_OPTIONS = [
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+
+@functools.lru_cache(maxsize=1)
+def _transfer_client() -> bigquery_datatransfer_v1.DataTransferServiceClient:
+    # configs carry the full SQL in params, so gzip pays off for list/update calls
+    channel = DataTransferServiceGrpcTransport.create_channel(
+        options=_GRPC_CHANNEL_OPTIONS,
+        compression=grpc.Compression.Gzip,
+    )
+    transport = DataTransferServiceGrpcTransport(channel=channel)
+    return bigquery_datatransfer_v1.DataTransferServiceClient(transport=transport)
+
+
+def get_bigquery_client(project_id: Optional[str] = None) -> bigquery.Client:
+    """
+    Returns a process-wide BigQuery client for project_id (None = ADC default project).
+    """
+    with _client_lock:
+        return _bq_client(project_id)
+
+
+def get_transfer_client() -> bigquery_datatransfer_v1.DataTransferServiceClient:
+    """
+    Returns a process-wide DataTransferServiceClient.
+    """
+    with _client_lock:
+        return _transfer_client()
+
+
+@dataclass(frozen=True, slots=True)
 class ParsedTableId:
     project_id: str
     dataset_id: str
     table_id: str
 
 
+@functools.lru_cache(maxsize=4096)
 def parse_table_id(destination_table: str, default_project: str) -> ParsedTableId:
     """
     Accepts 'dataset.table' or 'project.dataset.table' and returns ParsedTableId
     with default_project applied when needed.
     """
-    parts = destination_table.split(".")
-    if len(parts) == 2:
-        dataset_id, table_id = parts
-        project_id = default_project
-    elif len(parts) == 3:
-        project_id, dataset_id, table_id = parts
-    else:
-        raise ValueError(
-            f"destination_table must be 'dataset.table' or 'project.dataset.table', got '{destination_table}'"
+    first = destination_table.find(".")
+    last = destination_table.rfind(".")
+    if first != -1 and first == last:
+        return ParsedTableId(
+            project_id=default_project,
+            dataset_id=destination_table[:first],
+            table_id=destination_table[first + 1 :],
         )
-    return ParsedTableId(project_id=project_id, dataset_id=dataset_id, table_id=table_id)
+    if first != -1 and destination_table.find(".", first + 1) == last:
+        return ParsedTableId(
+            project_id=destination_table[:first],
+            dataset_id=destination_table[first + 1 : last],
+            table_id=destination_table[last + 1 :],
+        )
+    raise ValueError(
+        f"destination_table must be 'dataset.table' or 'project.dataset.table', got '{destination_table}'"
+    )
+
+
+# successful dry-run results, in process and on disk so repeated CLI runs benefit too
+DRY_RUN_CACHE_TTL = 600
+DRY_RUN_STATE = "dry_runs.json"
+_dry_run_cache: TTLCache[Tuple[int, float]] = TTLCache(maxsize=512, ttl=DRY_RUN_CACHE_TTL)
+
+
+def _cached_dry_run(key: str) -> Optional[Tuple[int, float]]:
+    result = _dry_run_cache.get(key)
+    if result is not None:
+        return result
+    entry = load_state(DRY_RUN_STATE).get(key)
+    if not isinstance(entry, dict):
+        return None
+    remaining = entry.get("expires_at", 0) - time.time()
+    if remaining <= 0:
+        return None
+    result = (int(entry["estimated_bytes"]), float(entry["slot_ms"]))
+    # keep the on-disk expiry instead of granting a fresh full TTL
+    _dry_run_cache.set(key, result, ttl=remaining)
+    return result
+
+
+def _store_dry_run(key: str, result: Tuple[int, float]) -> None:
+    _dry_run_cache.set(key, result)
+    now = time.time()
+    update_state(
+        DRY_RUN_STATE,
+        key,
+        {
+            "expires_at": now + DRY_RUN_CACHE_TTL,
+            "estimated_bytes": result[0],
+            "slot_ms": result[1],
+        },
+        prune=lambda entry: not isinstance(entry, dict) or entry.get("expires_at", 0) < now,
+    )
 
 
 def dry_run_query(
@@ -42,14 +142,30 @@ def dry_run_query(
     sql: str,
     max_bytes_billed: int,
     job_spec: JobSpec,
+    use_cache: bool = True,
 ) -> Tuple[int, float]:
     """
     Runs a BigQuery dry-run and returns (estimated_bytes, total_slot_ms).
+    Successful results are reused for DRY_RUN_CACHE_TTL seconds unless use_cache is False.
     Raises an exception on errors.
     """
+    cache_key = content_digest(sql, client.project or "", str(max_bytes_billed))
+    if use_cache:
+        cached = _cached_dry_run(cache_key)
+        if cached is not None:
+            logger.info(
+                "Reusing cached dry-run for job '%s': %d bytes, %f slot-ms",
+                job_spec.name,
+                cached[0],
+                cached[1],
+            )
+            return cached
+
     job_config = bigquery.QueryJobConfig(
         dry_run=True,
         use_query_cache=False,
+        # dry-runs never execute; BATCH keeps bulk deploys out of the interactive concurrency limit
+        priority=bigquery.QueryPriority.BATCH,
         maximum_bytes_billed=max_bytes_billed,
         labels=job_spec.labels,
     )
@@ -57,9 +173,17 @@ def dry_run_query(
     logger.info("Starting dry-run for job '%s'", job_spec.name)
     job = client.query(sql, job_config=job_config)
     # In a dry-run the job is not executed, but metadata is available
-    stats = job._job_statistics()  # not the most official API, but works; could use job._properties
-    estimated_bytes = int(stats.get("totalBytesProcessed", 0))
-    slot_ms = float(stats.get("totalSlotMs", 0))
+    # read the raw REST resource directly instead of the private _job_statistics() helper
+    statistics = job._properties.get("statistics", {})
+    query_stats = statistics.get("query", {})
+    if "totalBytesProcessed" not in query_stats:
+        # never fall back to 0: that would silently pass the max_bytes_billed guard
+        raise RuntimeError(
+            "Dry-run response has no statistics.query.totalBytesProcessed; "
+            "the google-cloud-bigquery job resource shape may have changed"
+        )
+    estimated_bytes = int(query_stats["totalBytesProcessed"])
+    slot_ms = float(statistics.get("totalSlotMs", query_stats.get("totalSlotMs", 0)))
 
     logger.info(
         "Dry-run for job '%s' estimated %d bytes, %f slot-ms",
@@ -73,9 +197,91 @@ def dry_run_query(
             f"Dry-run estimated {estimated_bytes} bytes, which exceeds max_bytes_billed={max_bytes_billed}"
         )
 
+    _store_dry_run(cache_key, (estimated_bytes, slot_ms))
     return estimated_bytes, slot_ms
 
 
+# (parent, dataset_id, display_name) -> TransferConfig, filled lazily by deploys
+_transfer_config_cache: TTLCache[bigquery_datatransfer_v1.TransferConfig] = TTLCache(
+    maxsize=4096, ttl=300
+)
+# sidecar file remembering resolved config names across runs
+TRANSFER_CONFIGS_STATE = "transfer_configs.json"
+
+
+def _matches(
+    cfg: bigquery_datatransfer_v1.TransferConfig, dataset_id: str, display_name: str
+) -> bool:
+    return (
+        cfg.display_name == display_name
+        and cfg.destination_dataset_id == dataset_id
+        and cfg.data_source_id == "scheduled_query"
+    )
+
+
+def _params_changed(
+    cfg: bigquery_datatransfer_v1.TransferConfig, params: Dict[str, str]
+) -> bool:
+    existing_params = cfg.params
+    # the server may omit empty params (e.g. partitioning_field) from what it returns
+    return any(existing_params.get(key, "") != value for key, value in params.items())
+
+
+def _remember_transfer_config(
+    key: Tuple[str, str, str], cfg: bigquery_datatransfer_v1.TransferConfig
+) -> None:
+    _transfer_config_cache.set(key, cfg)
+    update_state(TRANSFER_CONFIGS_STATE, "/".join(key), cfg.name)
+
+
+def _forget_transfer_config(key: Tuple[str, str, str]) -> None:
+    _transfer_config_cache.pop(key)
+    discard_state(TRANSFER_CONFIGS_STATE, "/".join(key))
+
+
+def find_transfer_config(
+    transfer_client: bigquery_datatransfer_v1.DataTransferServiceClient,
+    parent: str,
+    dataset_id: str,
+    display_name: str,
+) -> Optional[bigquery_datatransfer_v1.TransferConfig]:
+    """
+    Looks up the scheduled query config with the given display_name and dataset.
+    Checks the in-process cache, then the config name remembered from a previous
+    deploy, and only then lists the project's scheduled queries.
+    """
+    key = (parent, dataset_id, display_name)
+    cached = _transfer_config_cache.get(key)
+    if cached is not None:
+        return cached
+
+    known_name = load_state(TRANSFER_CONFIGS_STATE).get("/".join(key))
+    if known_name:
+        try:
+            cfg = transfer_client.get_transfer_config(name=known_name)
+        except api_exceptions.NotFound:
+            cfg = None
+        if cfg is not None and _matches(cfg, dataset_id, display_name):
+            _transfer_config_cache.set(key, cfg)
+            return cfg
+        # deleted or renamed since it was remembered; don't re-fetch it on every deploy
+        _forget_transfer_config(key)
+
+    request = bigquery_datatransfer_v1.ListTransferConfigsRequest(
+        parent=parent,
+        data_source_ids=["scheduled_query"],
+        page_size=1000,
+    )
+    # walk whole pages so the scan stops right after the page holding the match
+    pager = transfer_client.list_transfer_configs(request=request)
+    for page in pager.pages:
+        for cfg in page.transfer_configs:
+            if _matches(cfg, dataset_id, display_name):
+                _remember_transfer_config(key, cfg)
+                return cfg
+    return None
+
+
 def deploy_scheduled_query(
     job_spec: JobSpec,
     sql: str,
@@ -89,7 +295,7 @@ def deploy_scheduled_query(
 
     parsed = parse_table_id(job_spec.destination_table, default_project)
 
-    transfer_client = bigquery_datatransfer_v1.DataTransferServiceClient()
+    transfer_client = get_transfer_client()
 
     parent = transfer_client.common_project_path(parsed.project_id)
 
@@ -119,15 +325,10 @@ def deploy_scheduled_query(
         parsed.project_id,
     )
 
-    existing = None
-    for cfg in transfer_client.list_transfer_configs(parent=parent):
-        if (
-            cfg.display_name == job_spec.name
-            and cfg.destination_dataset_id == parsed.dataset_id
-            and cfg.data_source_id == "scheduled_query"
-        ):
-            existing = cfg
-            break
+    existing = find_transfer_config(
+        transfer_client, parent, parsed.dataset_id, job_spec.name
+    )
+    cache_key = (parent, parsed.dataset_id, job_spec.name)
 
     if existing is None:
         # create a new configuration
@@ -136,13 +337,37 @@ def deploy_scheduled_query(
             transfer_config=transfer_config,
         )
         logger.info("Created new scheduled query config: %s", created.name)
+        _remember_transfer_config(cache_key, created)
     else:
-        # update the existing configuration
+        # update the existing configuration, sending only the fields that changed;
+        # params carry the SQL, and re-sending them makes the server re-validate it
+        paths = []
+        if _params_changed(existing, params):
+            paths.append("params")
+        if existing.schedule != job_spec.schedule:
+            paths.append("schedule")
+        if existing.display_name != job_spec.name:
+            paths.append("display_name")
+        if not paths:
+            logger.info(
+                "Scheduled query config %s is up to date, skipping update", existing.name
+            )
+            return
+
         transfer_config.name = existing.name
-        # specify which fields we are updating
-        update_mask = {"paths": ["params", "schedule", "display_name"]}
-        updated = transfer_client.update_transfer_config(
-            transfer_config=transfer_config,
-            update_mask=update_mask,
+        update_mask = {"paths": paths}
+        try:
+            updated = transfer_client.update_transfer_config(
+                transfer_config=transfer_config,
+                update_mask=update_mask,
+            )
+        except api_exceptions.NotFound:
+            # the cached config was deleted meanwhile; the next deploy looks it up again
+            _forget_transfer_config(cache_key)
+            raise
+        logger.info(
+            "Updated existing scheduled query config: %s (%s)",
+            updated.name,
+            ", ".join(paths),
         )
-        logger.info("Updated existing scheduled query config: %s", updated.name)
+        _remember_transfer_config(cache_key, updated)
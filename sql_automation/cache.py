@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path.home() / ".cache" / "sql_automation"
+
+V = TypeVar("V")
+
+
+class TTLCache(Generic[V]):
+    """
+    Small thread-safe in-process cache with per-entry expiry.
+    The oldest entry is evicted when maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[float, V]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[V]:
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: V, ttl: Optional[float] = None) -> None:
+        """
+        Stores value; ttl overrides the cache-wide ttl for this entry.
+        """
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                del self._data[next(iter(self._data))]
+            expires_in = self.ttl if ttl is None else ttl
+            self._data[key] = (time.monotonic() + expires_in, value)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+
+def content_digest(*parts: str) -> str:
+    """
+    Short stable hex digest of the given strings (e.g. rendered SQL plus settings).
+    """
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part.encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+_state_lock = threading.Lock()
+
+
+def load_state(filename: str) -> Dict[str, Any]:
+    """
+    Reads a JSON state file from CACHE_DIR; missing or broken files yield {}.
+    """
+    path = CACHE_DIR / filename
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_state(filename: str, data: Dict[str, Any]) -> None:
+    path = CACHE_DIR / filename
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning("Could not write cache state %s: %s", path, e)
+
+
+def update_state(
+    filename: str,
+    key: str,
+    value: Any,
+    prune: Optional[Callable[[Any], bool]] = None,
+) -> None:
+    """
+    Sets key in a JSON state file under CACHE_DIR. Failures are logged, not raised:
+    the state only serves as a shortcut and is never required for correctness.
+    Entries for which prune(value) is true are dropped on the same write.
+    """
+    with _state_lock:
+        data = load_state(filename)
+        if prune is not None:
+            data = {k: v for k, v in data.items() if not prune(v)}
+        data[key] = value
+        _write_state(filename, data)
+
+
+def discard_state(filename: str, key: str) -> None:
+    """
+    Removes key from a JSON state file under CACHE_DIR, if present.
+    """
+    with _state_lock:
+        data = load_state(filename)
+        if key in data:
+            del data[key]
+            _write_state(filename, data)
@@ -1,15 +1,19 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import List
 
-from google.cloud import bigquery
-
+from .cache import content_digest, load_state, update_state
 from .config import load_job_spec
 from .renderer import SqlRenderer
-from .bigquery_ops import dry_run_query, deploy_scheduled_query
+
+# bigquery_ops is imported inside the BigQuery commands: loading the google-cloud
+# client libraries (gRPC, protobuf) dominates start-up of validate/render otherwise
 
 logging.basicConfig(
     level=logging.INFO,
@@ -17,6 +21,9 @@ logging.basicConfig(
 )
 logger = logging.getLogger("sql_automation.cli")
 
+# '<project>/<job name>' -> digest of the SQL and limits of the last successful deploy
+DEPLOY_STATE = "deploy_state.json"
+
 
 def cmd_validate(args: argparse.Namespace) -> int:
     path = Path(args.spec)
@@ -25,7 +32,10 @@ def cmd_validate(args: argparse.Namespace) -> int:
     except Exception as e:
         logger.error("Spec validation failed: %s", e)
         return 1
-    logger.info("Spec is valid. Parsed model:\n%s", spec.model_dump_json(indent=2))
+    logger.info("OK %s", path)
+    if args.print_model:
+        # pydantic-core serializes to JSON natively; print to stdout so it can be piped
+        print(spec.model_dump_json(indent=2, exclude_defaults=True))
     return 0
 
 
@@ -60,8 +70,10 @@ def cmd_dry_run(args: argparse.Namespace) -> int:
         logger.error("Pre-dry-run failed (spec/template): %s", e)
         return 1
 
+    from .bigquery_ops import dry_run_query, get_bigquery_client
+
     project_id = args.project or None
-    client = bigquery.Client(project=project_id)
+    client = get_bigquery_client(project_id)
 
     try:
         estimated_bytes, slot_ms = dry_run_query(
@@ -69,6 +81,7 @@ def cmd_dry_run(args: argparse.Namespace) -> int:
             sql=sql,
             max_bytes_billed=spec.limits.max_bytes_billed,
             job_spec=spec,
+            use_cache=not args.no_cache,
         )
     except Exception as e:
         logger.error("Dry-run failed: %s", e)
@@ -82,47 +95,143 @@ def cmd_dry_run(args: argparse.Namespace) -> int:
     return 0
 
 
-def cmd_deploy(args: argparse.Namespace) -> int:
-    spec_path = Path(args.spec)
-    templates_root = Path(args.templates_root)
+def _deploy_spec(
+    spec_path: Path,
+    templates_root: Path,
+    project_id: str,
+    location: str,
+    force: bool = False,
+) -> int:
+    from .bigquery_ops import deploy_scheduled_query, dry_run_query, get_bigquery_client
+
     try:
         spec = load_job_spec(spec_path)
         renderer = SqlRenderer(templates_root)
         sql = renderer.render(spec.sql_template, spec.parameters)
     except Exception as e:
-        logger.error("Pre-deploy failed (spec/template): %s", e)
+        logger.error("Pre-deploy failed (spec/template) for %s: %s", spec_path, e)
         return 1
 
-    project_id = args.project
-    if not project_id:
-        logger.error("--project is required for deploy")
-        return 1
+    state_key = f"{project_id}/{spec.name}"
+    sql_digest = content_digest(sql, str(spec.limits.max_bytes_billed))
 
-    # dry-run before deployment (could be optional, but recommended to keep mandatory per guidance)
-    client = bigquery.Client(project=project_id)
-    try:
-        dry_run_query(
-            client=client,
-            sql=sql,
-            max_bytes_billed=spec.limits.max_bytes_billed,
-            job_spec=spec,
-        )
-    except Exception as e:
-        logger.error("Dry-run before deploy failed: %s", e)
-        return 1
+    # dry-run before deployment (could be optional, but recommended to keep mandatory per guidance);
+    # skipped when exactly this SQL was already dry-run and deployed successfully
+    if not force and load_state(DEPLOY_STATE).get(state_key) == sql_digest:
+        logger.info("SQL for '%s' unchanged since last deploy, skipping dry-run", spec.name)
+    else:
+        client = get_bigquery_client(project_id)
+        try:
+            dry_run_query(
+                client=client,
+                sql=sql,
+                max_bytes_billed=spec.limits.max_bytes_billed,
+                job_spec=spec,
+                use_cache=not force,
+            )
+        except Exception as e:
+            logger.error("Dry-run before deploy failed for %s: %s", spec_path, e)
+            return 1
 
     try:
         deploy_scheduled_query(
             job_spec=spec,
             sql=sql,
             default_project=project_id,
-            location=args.location,
+            location=location,
         )
     except Exception as e:
-        logger.error("Deploy failed: %s", e)
+        logger.error("Deploy failed for %s: %s", spec_path, e)
+        return 1
+
+    update_state(DEPLOY_STATE, state_key, sql_digest)
+    logger.info("Deploy of %s finished successfully", spec_path)
+    return 0
+
+
+def cmd_deploy(args: argparse.Namespace) -> int:
+    project_id = args.project
+    if not project_id:
+        logger.error("--project is required for deploy")
+        return 1
+    return _deploy_spec(
+        Path(args.spec), Path(args.templates_root), project_id, args.location, args.force
+    )
+
+
+async def _deploy_many(
+    spec_paths: List[Path],
+    templates_root: Path,
+    project_id: str,
+    location: str,
+    max_concurrency: int,
+    force: bool,
+) -> List[int]:
+    # the BigQuery/DataTransfer calls are blocking, so each spec runs in a worker
+    # thread; the shared cached clients are safe to use from several threads.
+    # A dedicated pool sized to max_concurrency is the limit: the loop's default
+    # executor is capped at min(32, cpu_count + 4) workers.
+    loop = asyncio.get_running_loop()
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        results = await asyncio.gather(
+            *(
+                loop.run_in_executor(
+                    executor,
+                    _deploy_spec,
+                    spec_path,
+                    templates_root,
+                    project_id,
+                    location,
+                    force,
+                )
+                for spec_path in spec_paths
+            ),
+            return_exceptions=True,
+        )
+    codes = []
+    for spec_path, result in zip(spec_paths, results):
+        if isinstance(result, BaseException):
+            logger.error("Deploy failed for %s: %s", spec_path, result)
+            codes.append(1)
+        else:
+            codes.append(result)
+    return codes
+
+
+def cmd_deploy_all(args: argparse.Namespace) -> int:
+    specs_dir = Path(args.specs_dir)
+    if not specs_dir.is_dir():
+        logger.error("specs directory not found: %s", specs_dir)
+        return 1
+    spec_paths = sorted(specs_dir.glob("*.yaml")) + sorted(specs_dir.glob("*.yml"))
+    if not spec_paths:
+        logger.error("No *.yaml specs found in %s", specs_dir)
+        return 1
+    if args.max_concurrency < 1:
+        logger.error("--max-concurrency must be at least 1")
         return 1
 
-    logger.info("Deploy finished successfully")
+    codes = asyncio.run(
+        _deploy_many(
+            spec_paths,
+            Path(args.templates_root),
+            args.project,
+            args.location,
+            args.max_concurrency,
+            args.force,
+        )
+    )
+    failed = [p for p, code in zip(spec_paths, codes) if code != 0]
+    if failed:
+        logger.error(
+            "%d of %d specs failed: %s",
+            len(failed),
+            len(spec_paths),
+            ", ".join(str(p) for p in failed),
+        )
+        return 1
+
+    logger.info("All %d specs deployed successfully", len(spec_paths))
     return 0
 
 
@@ -136,6 +245,11 @@ def build_parser() -> argparse.ArgumentParser:
     # validate
     p_val = sub.add_parser("validate", help="Validate job spec YAML.")
     p_val.add_argument("--spec", required=True, help="Path to job-spec.yaml")
+    p_val.add_argument(
+        "--print-model",
+        action="store_true",
+        help="Print the parsed model as JSON (fields left at their defaults are omitted).",
+    )
     p_val.set_defaults(func=cmd_validate)
 
     # render
@@ -165,6 +279,11 @@ def build_parser() -> argparse.ArgumentParser:
         required=False,
         help="GCP project id for BigQuery. If omitted, uses default credentials project.",
     )
+    p_dr.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not reuse a cached result of an identical recent dry-run.",
+    )
     p_dr.set_defaults(func=cmd_dry_run)
 
     # deploy
@@ -188,8 +307,51 @@ def build_parser() -> argparse.ArgumentParser:
         default="US",
         help="BigQuery/Data Transfer location (default: US).",
     )
+    p_dep.add_argument(
+        "--force",
+        action="store_true",
+        help="Always run a fresh dry-run, ignoring the last deploy state and cached dry-run results.",
+    )
     p_dep.set_defaults(func=cmd_deploy)
 
+    # deploy-all
+    p_all = sub.add_parser(
+        "deploy-all",
+        help="Dry-run and deploy every job spec in a directory concurrently.",
+    )
+    p_all.add_argument(
+        "--specs-dir",
+        required=True,
+        help="Directory with job spec YAML files (*.yaml, *.yml).",
+    )
+    p_all.add_argument(
+        "--templates-root",
+        required=True,
+        help="Path to root directory with SQL templates.",
+    )
+    p_all.add_argument(
+        "--project",
+        required=True,
+        help="GCP project id where scheduled queries will be created.",
+    )
+    p_all.add_argument(
+        "--location",
+        default="US",
+        help="BigQuery/Data Transfer location (default: US).",
+    )
+    p_all.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=16,
+        help="Maximum number of specs processed at the same time (default: 16).",
+    )
+    p_all.add_argument(
+        "--force",
+        action="store_true",
+        help="Always run a fresh dry-run, ignoring the last deploy state and cached dry-run results.",
+    )
+    p_all.set_defaults(func=cmd_deploy_all)
+
     return p
 
 
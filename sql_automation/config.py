@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import functools
+import re
 from pathlib import Path
 from typing import Dict, Optional, Any
 
@@ -7,6 +9,19 @@ import yaml
 from pydantic import BaseModel, Field, field_validator, model_validator
 from crontab import CronSlices
 
+try:  # libyaml-backed loader is much faster when PyYAML was built with it
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
+# cheap shape check before the full cron parse: '@special' or 5-7 whitespace-separated fields
+_CRON_RE = re.compile(r"@\w+|\S+(?:\s+\S+){4,6}")
+
+_EVERY_PREFIX = "every "
+
+# the same schedules repeat across specs and environments
+_is_valid_cron = functools.lru_cache(maxsize=1024)(CronSlices.is_valid)
+
 
 class Limits(BaseModel):
     max_bytes_billed: int = Field(
@@ -65,10 +80,11 @@ class JobSpec(BaseModel):
         Basic validation: either cron or a string like 'every ...'.
         """
         v_stripped = v.strip()
-        if v_stripped.lower().startswith("every "):
+        # cron strings never start with 'e', so they skip the lower() copy entirely
+        if v_stripped[:1] in ("e", "E") and v_stripped[:6].lower() == _EVERY_PREFIX:
             return v_stripped
         # allow cron strings validated via CronSlices
-        if not CronSlices.is_valid(v_stripped):
+        if not _CRON_RE.fullmatch(v_stripped) or not _is_valid_cron(v_stripped):
             raise ValueError(
                 f"schedule must be valid cron or 'every ...' string, got '{v_stripped}'"
             )
@@ -79,8 +95,7 @@ class JobSpec(BaseModel):
     def validate_destination_table(cls, v: str) -> str:
         raw = v.strip()
         # allow 'project.dataset.table' or 'dataset.table'
-        parts = raw.split(".")
-        if len(parts) not in (2, 3):
+        if raw.count(".") not in (1, 2):
             raise ValueError(
                 "destination_table must be 'dataset.table' or 'project.dataset.table', "
                 f"got '{raw}'"
@@ -105,11 +120,19 @@ class JobSpec(BaseModel):
         return self
 
 
-def load_job_spec(path: Path) -> JobSpec:
-    if not path.exists():
-        raise FileNotFoundError(f"job spec file not found: {path}")
-    with path.open("r", encoding="utf-8") as f:
-        data = yaml.safe_load(f)
+@functools.lru_cache(maxsize=256)
+def _load_job_spec_data(path_str: str, mtime_ns: int) -> Dict[str, Any]:
+    # mtime_ns is part of the key only, so that edited specs are re-read
+    data = yaml.load(Path(path_str).read_bytes(), Loader=_SafeLoader)
     if not isinstance(data, dict):
         raise ValueError(f"job spec must be YAML mapping, got {type(data)}")
-    return JobSpec(**data)
+    return data
+
+
+def load_job_spec(path: Path) -> JobSpec:
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise FileNotFoundError(f"job spec file not found: {path}") from None
+    # validation builds new containers, so the cached mapping is never mutated
+    return JobSpec.model_validate(_load_job_spec_data(str(path.resolve()), mtime_ns))
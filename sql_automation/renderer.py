@@ -1,28 +1,64 @@
 from __future__ import annotations
 
+import functools
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
-from jinja2 import Environment, FileSystemLoader, StrictUndefined, TemplateError
+from jinja2 import (
+    BytecodeCache,
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    StrictUndefined,
+    Template,
+    TemplateError,
+)
+
+from .cache import CACHE_DIR
+
+BYTECODE_CACHE_DIR = CACHE_DIR / "jinja"
+
+
+def _bytecode_cache() -> Optional[BytecodeCache]:
+    # compiled templates survive across CLI invocations; skip silently if the dir is not writable
+    try:
+        BYTECODE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(directory=str(BYTECODE_CACHE_DIR))
+
+
+@functools.lru_cache(maxsize=16)
+def _get_environment(root_str: str) -> Environment:
+    return Environment(
+        loader=FileSystemLoader(root_str),
+        undefined=StrictUndefined,  # unknown vars -> error
+        autoescape=False,
+        trim_blocks=True,
+        lstrip_blocks=True,
+        bytecode_cache=_bytecode_cache(),
+    )
+
+
+@functools.lru_cache(maxsize=256)
+def _get_template(root_str: str, template_path: str, mtime_ns: int) -> Template:
+    # mtime_ns is part of the key only, so that edited templates are reloaded
+    return _get_environment(root_str).get_template(template_path)
 
 
 class SqlRenderer:
     def __init__(self, templates_root: Path) -> None:
         self.templates_root = templates_root
-        loader = FileSystemLoader(str(templates_root))
-        self.env = Environment(
-            loader=loader,
-            undefined=StrictUndefined,  # unknown vars -> error
-            autoescape=False,
-            trim_blocks=True,
-            lstrip_blocks=True,
-        )
+        self.env = _get_environment(str(templates_root))
 
     def render(self, template_path: str, parameters: Dict[str, Any]) -> str:
         try:
-            template = self.env.get_template(template_path)
-        except TemplateError as e:
+            mtime_ns = Path(self.templates_root, template_path).stat().st_mtime_ns
+            template = _get_template(str(self.templates_root), template_path, mtime_ns)
+        except (OSError, TemplateError) as e:
             raise RuntimeError(f"failed to load SQL template '{template_path}': {e}") from e
+        # the cached Template is already compiled to a Python render function by Jinja;
+        # included templates are resolved through the shared Environment's auto_reload check
         try:
             sql = template.render(**parameters)
         except TemplateError as e:
@@ -0,0 +1,198 @@
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+import pytest
+
+bigquery = pytest.importorskip("google.cloud.bigquery")
+from google.auth.credentials import AnonymousCredentials  # noqa: E402
+
+from sql_automation import bigquery_ops, cache  # noqa: E402
+
+PROJECT = "test-project"
+
+
+def _job_resource(query_stats: dict) -> dict:
+    # shape of a jobs.insert response for a dry-run query
+    return {
+        "jobReference": {"projectId": PROJECT, "jobId": "dry-run", "location": "US"},
+        "configuration": {"query": {"query": "SELECT 1"}, "dryRun": True},
+        "status": {"state": "DONE"},
+        "statistics": {"totalSlotMs": "0", "query": query_stats},
+    }
+
+
+class FakeClient:
+    def __init__(self, resource: dict) -> None:
+        self.project = PROJECT
+        self._real = bigquery.Client(project=PROJECT, credentials=AnonymousCredentials())
+        self._resource = resource
+
+    def query(self, sql, job_config=None):
+        return bigquery.QueryJob.from_api_repr(self._resource, self._real)
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+
+
+@pytest.fixture
+def job_spec():
+    return SimpleNamespace(name="daily_revenue_by_country", labels={"owner": "analytics"})
+
+
+def test_job_properties_shape_is_pinned(job_spec):
+    client = FakeClient(_job_resource({"totalBytesProcessed": "12345", "totalSlotMs": "0"}))
+
+    # the SDK must keep exposing the raw REST resource that dry_run_query reads
+    job = client.query("SELECT 1")
+    assert job._properties["statistics"]["query"]["totalBytesProcessed"] == "12345"
+    assert job.total_bytes_processed == 12345
+
+    estimated_bytes, slot_ms = bigquery_ops.dry_run_query(
+        client, "SELECT 1", max_bytes_billed=10**9, job_spec=job_spec, use_cache=False
+    )
+    assert estimated_bytes == 12345
+    assert slot_ms == 0.0
+
+
+def test_missing_total_bytes_processed_raises(job_spec):
+    client = FakeClient(_job_resource({}))
+
+    with pytest.raises(RuntimeError, match="totalBytesProcessed"):
+        bigquery_ops.dry_run_query(
+            client, "SELECT 1", max_bytes_billed=10**9, job_spec=job_spec, use_cache=False
+        )
+
+
+def test_estimate_above_limit_raises(job_spec):
+    client = FakeClient(_job_resource({"totalBytesProcessed": "2000"}))
+
+    with pytest.raises(RuntimeError, match="exceeds max_bytes_billed"):
+        bigquery_ops.dry_run_query(
+            client, "SELECT 1", max_bytes_billed=1000, job_spec=job_spec, use_cache=False
+        )
+
+
+def test_stale_transfer_config_name_is_forgotten():
+    from google.api_core import exceptions as api_exceptions
+
+    parent = f"projects/{PROJECT}"
+    key = (parent, "analytics", "daily_revenue_by_country")
+    cache.update_state(bigquery_ops.TRANSFER_CONFIGS_STATE, "/".join(key), "deleted-config")
+
+    class FakeTransferClient:
+        def get_transfer_config(self, name):
+            raise api_exceptions.NotFound(name)
+
+        def list_transfer_configs(self, request):
+            return SimpleNamespace(pages=[])
+
+    found = bigquery_ops.find_transfer_config(FakeTransferClient(), *key)
+
+    assert found is None
+    assert "/".join(key) not in cache.load_state(bigquery_ops.TRANSFER_CONFIGS_STATE)
+
+
+def test_dry_run_loaded_from_disk_keeps_its_expiry(monkeypatch):
+    now = 1_000_000.0
+    monkeypatch.setattr(bigquery_ops.time, "time", lambda: now)
+    cache.update_state(
+        bigquery_ops.DRY_RUN_STATE,
+        "key",
+        {"expires_at": now + 5, "estimated_bytes": 10, "slot_ms": 0.0},
+    )
+    seen = {}
+    monkeypatch.setattr(
+        bigquery_ops._dry_run_cache,
+        "set",
+        lambda key, value, ttl=None: seen.update(key=key, value=value, ttl=ttl),
+    )
+
+    assert bigquery_ops._cached_dry_run("key") == (10, 0.0)
+    assert seen == {"key": "key", "value": (10, 0.0), "ttl": 5}
+
+
+class FakeDeployTransferClient:
+    def __init__(self, existing):
+        self.existing = existing
+        self.updates = []
+        self.creates = []
+
+    def common_project_path(self, project):
+        return f"projects/{project}"
+
+    def list_transfer_configs(self, request):
+        return SimpleNamespace(pages=[SimpleNamespace(transfer_configs=[self.existing])])
+
+    def update_transfer_config(self, transfer_config, update_mask):
+        self.updates.append(update_mask["paths"])
+        return transfer_config
+
+    def create_transfer_config(self, parent, transfer_config):
+        self.creates.append(transfer_config)
+        return transfer_config
+
+
+DEPLOY_SQL = "SELECT 1"
+
+
+@pytest.fixture
+def deploy_spec():
+    return SimpleNamespace(
+        name="daily_revenue_by_country",
+        destination_table="analytics.daily_revenue_by_country",
+        write_disposition="WRITE_TRUNCATE",
+        schedule="0 3 * * *",
+    )
+
+
+@pytest.fixture
+def deploy_with(monkeypatch, deploy_spec):
+    from google.cloud import bigquery_datatransfer_v1
+
+    monkeypatch.setattr(
+        bigquery_ops, "_transfer_config_cache", cache.TTLCache(maxsize=16, ttl=300)
+    )
+
+    def deploy(schedule="0 3 * * *", sql=DEPLOY_SQL):
+        # as returned by the server: the empty partitioning_field is left out
+        existing = bigquery_datatransfer_v1.TransferConfig(
+            name=f"projects/{PROJECT}/transferConfigs/123",
+            display_name=deploy_spec.name,
+            destination_dataset_id="analytics",
+            data_source_id="scheduled_query",
+            schedule="0 3 * * *",
+            params={
+                "query": DEPLOY_SQL,
+                "destination_table_name_template": "daily_revenue_by_country",
+                "write_disposition": "WRITE_TRUNCATE",
+            },
+        )
+        client = FakeDeployTransferClient(existing)
+        monkeypatch.setattr(bigquery_ops, "get_transfer_client", lambda: client)
+        deploy_spec.schedule = schedule
+        bigquery_ops.deploy_scheduled_query(deploy_spec, sql, default_project=PROJECT)
+        return client
+
+    return deploy
+
+
+def test_unchanged_config_is_not_updated(deploy_with):
+    client = deploy_with()
+
+    assert client.updates == []
+    assert client.creates == []
+
+
+def test_schedule_change_updates_only_schedule(deploy_with):
+    client = deploy_with(schedule="0 4 * * *")
+
+    assert client.updates == [["schedule"]]
+
+
+def test_sql_change_updates_params(deploy_with):
+    client = deploy_with(sql="SELECT 2")
+
+    assert client.updates == [["params"]]
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("google.cloud.bigquery")
+
+from sql_automation import bigquery_ops, cache, cli, renderer  # noqa: E402
+
+EXAMPLES = Path(__file__).resolve().parent.parent / "examples"
+DEPLOY_ARGS = [
+    "deploy",
+    "--spec",
+    str(EXAMPLES / "job-spec.yaml"),
+    "--templates-root",
+    str(EXAMPLES / "sql"),
+    "--project",
+    "test-project",
+]
+
+
+@pytest.fixture
+def calls(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path)
+    monkeypatch.setattr(renderer, "BYTECODE_CACHE_DIR", tmp_path / "jinja")
+    calls = {"dry_run": 0, "deploy": 0, "deploy_fails": False}
+
+    def fake_dry_run_query(**kwargs):
+        calls["dry_run"] += 1
+        return 100, 0.0
+
+    def fake_deploy_scheduled_query(**kwargs):
+        calls["deploy"] += 1
+        if calls["deploy_fails"]:
+            raise RuntimeError("permission denied")
+
+    monkeypatch.setattr(bigquery_ops, "dry_run_query", fake_dry_run_query)
+    monkeypatch.setattr(bigquery_ops, "deploy_scheduled_query", fake_deploy_scheduled_query)
+    monkeypatch.setattr(bigquery_ops, "get_bigquery_client", lambda project_id=None: None)
+    return calls
+
+
+def test_redeploy_of_same_sql_skips_dry_run(calls):
+    assert cli.main(DEPLOY_ARGS) == 0
+    assert cli.main(DEPLOY_ARGS) == 0
+
+    assert calls["dry_run"] == 1
+    assert calls["deploy"] == 2
+
+
+def test_force_runs_dry_run_again(calls):
+    assert cli.main(DEPLOY_ARGS) == 0
+    assert cli.main(DEPLOY_ARGS + ["--force"]) == 0
+
+    assert calls["dry_run"] == 2
+
+
+def test_failed_deploy_does_not_record_digest(calls):
+    calls["deploy_fails"] = True
+    assert cli.main(DEPLOY_ARGS) == 1
+    assert cache.load_state(cli.DEPLOY_STATE) == {}
+
+    calls["deploy_fails"] = False
+    assert cli.main(DEPLOY_ARGS) == 0
+    assert calls["dry_run"] == 2
@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pytest.importorskip("jinja2")
+
+from sql_automation import renderer  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def no_bytecode_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(renderer, "BYTECODE_CACHE_DIR", tmp_path / "jinja")
+
+
+def _write(path, text, mtime):
+    path.write_text(text, encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+def test_edited_include_is_picked_up(tmp_path):
+    root = tmp_path / "sql"
+    root.mkdir()
+    _write(root / "main.sql.j2", "SELECT {% include 'inc.j2' %} FROM t", 1_000_000)
+    _write(root / "inc.j2", "a", 1_000_000)
+
+    sql_renderer = renderer.SqlRenderer(root)
+    assert sql_renderer.render("main.sql.j2", {}) == "SELECT a FROM t"
+
+    _write(root / "inc.j2", "b", 1_000_100)
+    assert sql_renderer.render("main.sql.j2", {}) == "SELECT b FROM t"